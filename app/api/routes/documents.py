@@ -1,15 +1,24 @@
 """Document management endpoints."""
 
-from fastapi import APIRouter, HTTPException, UploadFile, File
+import asyncio
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 
 from app.api.schemas import (
     DocumentListResponse,
     DocumentUploadResponse,
     ErrorResponse
 )
-from app.core.vector_store import VectorStoreService
+from app.config import get_settings
+from app.core.answer_cache import AnswerCache, get_answer_cache
+from app.core.vector_store import VectorStoreService, get_vector_store
 from app.utils.logger import get_logger
-from app.core.document_processor import DocumentProcessor
+from app.core.document_processor import (
+    DocumentProcessor,
+    UploadTooLargeError,
+    get_document_processor,
+)
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/documents", tags=["documents"])
@@ -19,14 +28,23 @@ router = APIRouter(prefix="/documents", tags=["documents"])
     response_model=DocumentUploadResponse,
     responses={
         400: {"model": ErrorResponse, "description": "Invalid file type"},
+        413: {"model": ErrorResponse, "description": "File too large"},
         500: {"model": ErrorResponse, "description": "Processing error"},
     },
 )
-async def upload_document(file: UploadFile = File(..., description="Document file to upload")) -> DocumentUploadResponse:
+async def upload_document(
+    file: UploadFile = File(..., description="Document file to upload"),
+    processor: DocumentProcessor = Depends(get_document_processor),
+    vector_store: VectorStoreService = Depends(get_vector_store),
+    answer_cache: AnswerCache = Depends(get_answer_cache),
+) -> DocumentUploadResponse:
     """Upload a document and process it into chunks.
 
     Args:
         file: Uploaded document file
+        processor: Shared document processor
+        vector_store: Shared vector store service
+        answer_cache: Shared answer cache, cleared once new documents are added
 
     Returns:
         DocumentUploadResponse: Details about the uploaded document and processing status
@@ -34,31 +52,60 @@ async def upload_document(file: UploadFile = File(..., description="Document fil
     logger.info(f"Received document upload: {file.filename}")
     if not file.filename:
         raise HTTPException(status_code=400, detail="Filename is required")
+
+    # Reject unsupported types before any of the upload is copied or parsed
+    extension = Path(file.filename).suffix.lower()
+    if extension not in DocumentProcessor.SUPPORTED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Unsupported file extension: {extension}. "
+                f"Supported: {', '.join(sorted(DocumentProcessor.SUPPORTED_EXTENSIONS))}"
+            ),
+        )
+
+    # Reject oversized uploads up front using the size Starlette recorded
+    max_bytes = get_settings().max_upload_bytes
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File exceeds maximum upload size of {max_bytes} bytes",
+        )
+
     try: 
-        # Process uploaded file into chunked documents
-        processor = DocumentProcessor()
-        chunked_docs = processor.load_from_uploaded_file(file.file, file.filename)
-        vector_store = VectorStoreService()
+        # Read the upload in place; the limit is enforced again while copying
+        documents = await asyncio.to_thread(
+            processor.load_from_uploaded_file, file.file, file.filename, max_bytes
+        )
 
-        # Add chunked documents to vector store
-        document_ids = vector_store.add_documents(chunked_docs)
+        # Stream chunks through embedding and upsert in batches
+        document_ids = await vector_store.aadd_documents_streaming(
+            processor.iter_split_documents(documents)
+        )
         logger.info(
             f"Successfully processed {file.filename}: "
-            f"{len(chunked_docs)} chunks, {len(document_ids)} documents"
+            f"{len(documents)} documents, {len(document_ids)} chunks"
         )
-        response = DocumentUploadResponse(
+        # Server-built data, so skip re-validating every document ID; FastAPI
+        # accepts the instance as is and serializes it with dump_json
+        return DocumentUploadResponse.model_construct(
             message="Document uploaded and processed successfully",
             filename=file.filename,
-            chunks_created=len(chunked_docs),
+            chunks_created=len(document_ids),
             document_ids=document_ids
         )
-        return response
+    except UploadTooLargeError as e:
+        logger.error(f"Upload error: {e}")
+        raise HTTPException(status_code=413, detail=str(e))
     except ValueError as ve:
         logger.error(f"Upload error: {ve}")
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"Processing error: {e}")
         raise HTTPException(status_code=500, detail="Error processing document")
+    finally:
+        # A failed ingest may still have upserted some batches
+        answer_cache.clear()
 
 
 @router.get(
@@ -67,12 +114,13 @@ async def upload_document(file: UploadFile = File(..., description="Document fil
     summary="Get collection information",
     description="Get information about the document collection.",
 )
-async def get_collection_info() -> DocumentListResponse:
+async def get_collection_info(
+    vector_store: VectorStoreService = Depends(get_vector_store),
+) -> DocumentListResponse:
     """Get information about the document collection."""
     logger.debug("Collection info requested")
 
     try:
-        vector_store = VectorStoreService()
         info = vector_store.get_collection_info()
 
         return DocumentListResponse(
@@ -97,13 +145,16 @@ async def get_collection_info() -> DocumentListResponse:
     summary="Delete the entire collection",
     description="Delete all documents from the vector store. Use with caution!",
 )
-async def delete_collection() -> dict:
+async def delete_collection(
+    vector_store: VectorStoreService = Depends(get_vector_store),
+    answer_cache: AnswerCache = Depends(get_answer_cache),
+) -> dict:
     """Delete the entire document collection."""
     logger.warning("Collection deletion requested")
 
     try:
-        vector_store = VectorStoreService()
         vector_store.delete_collection()
+        answer_cache.clear()
 
         return {"message": "Collection deleted successfully"}
     except Exception as e:
@@ -2,7 +2,9 @@
 
 import time
 
-from fastapi import APIRouter, HTTPException
+import numpy as np
+import orjson
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 
 from app.api.schemas import (
@@ -12,7 +14,8 @@ from app.api.schemas import (
     QueryResponse,
     SourceDocument,
 )
-from app.core.rag_chain import RAGChain
+from app.core.rag_chain import RAGChain, get_rag_chain
+from app.core.vector_store import VectorStoreService, get_vector_store
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -26,10 +29,25 @@ router = APIRouter(prefix="/query", tags=["Query"])
         400: {"model": ErrorResponse, "description": "Invalid request"},
     },
 )
-async def query(request: QueryRequest) -> QueryResponse:
+async def query(
+    request: QueryRequest,
+    rag_chain: RAGChain = Depends(get_rag_chain),
+) -> QueryResponse:
     try:
-        rag_chain = RAGChain()
         start_time = time.time()
+
+        # Evaluation scores are per-response, so evaluated queries bypass the cache
+        if not request.enable_evaluation:
+            cached, cache_generation = await rag_chain.aget_cached_response(
+                request.question, request.include_sources
+            )
+            if cached is not None:
+                processing_time = (time.time() - start_time) * 1000
+                return cached.model_copy(update={
+                    "question": request.question,
+                    "processing_time_ms": round(processing_time, 2),
+                })
+
         if request.enable_evaluation:
             response = await rag_chain.aquery_with_evaluation(
                 question=request.question,
@@ -73,13 +91,18 @@ async def query(request: QueryRequest) -> QueryResponse:
             f"(eval_included={request.enable_evaluation})"
         )
 
-        return QueryResponse(
+        response = QueryResponse(
             question=request.question,
             answer=answer,
             sources=sources,
             processing_time_ms=round(processing_time, 2),
             evaluation=evaluation,
         )
+        if not request.enable_evaluation:
+            await rag_chain.acache_response(
+                request.question, request.include_sources, response, cache_generation
+            )
+        return response
     except Exception as e:
         logger.error(f"Error processing query: {e}")
         raise HTTPException(
@@ -96,17 +119,18 @@ async def query(request: QueryRequest) -> QueryResponse:
     summary="Ask a question (streaming)",
     description="Submit a question and get a streaming AI-generated answer.",
 )
-async def query_stream(request: QueryRequest) -> StreamingResponse:
+async def query_stream(
+    request: QueryRequest,
+    rag_chain: RAGChain = Depends(get_rag_chain),
+) -> StreamingResponse:
     """Process a RAG query with streaming response."""
     logger.info(f"Streaming query received: {request.question[:100]}...")
 
     try:
-        rag_chain = RAGChain()
-
         async def generate():
             """Generate streaming response."""
             try:
-                for chunk in rag_chain.stream(request.question):
+                async for chunk in rag_chain.astream(request.question):
                     yield chunk
             except Exception as e:
                 logger.error(f"Error in stream: {e}")
@@ -133,30 +157,40 @@ async def query_stream(request: QueryRequest) -> StreamingResponse:
 )
 async def search_documents(
     request: QueryRequest,
-) -> dict:
+    vector_store: VectorStoreService = Depends(get_vector_store),
+) -> StreamingResponse:
     """Search for relevant documents."""
     logger.info(f"Search received: {request.question[:100]}...")
 
     try:
-        from app.core.vector_store import VectorStoreService
-
-        vector_store = VectorStoreService()
-        results = vector_store.search_with_scores(request.question)
-
-        documents = [
-            {
-                "content": doc.page_content,
-                "metadata": doc.metadata,
-                "relevance_score": round(score, 4),
-            }
-            for doc, score in results
-        ]
-
-        return {
-            "query": request.question,
-            "results": documents,
-            "count": len(documents),
-        }
+        results = await vector_store.asearch_with_scores(request.question)
+
+        # float32 scores are emitted directly by orjson (OPT_SERIALIZE_NUMPY)
+        scores = np.fromiter(
+            (score for _, score in results),
+            dtype=np.float32,
+            count=len(results),
+        )
+
+        async def generate():
+            """Encode the response one document at a time."""
+            yield b'{"query":' + orjson.dumps(request.question) + b',"results":['
+            for index, ((doc, _), score) in enumerate(zip(results, scores)):
+                document = orjson.dumps(
+                    {
+                        "content": doc.page_content,
+                        "metadata": doc.metadata,
+                        "relevance_score": score,
+                    },
+                    option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                )
+                yield document if index == 0 else b"," + document
+            yield b'],"count":' + str(len(results)).encode() + b"}"
+
+        return StreamingResponse(
+            generate(),
+            media_type="application/json",
+        )
 
     except Exception as e:
         logger.error(f"Error searching documents: {e}")
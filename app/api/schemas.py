@@ -32,8 +32,18 @@ class DocumentUploadResponse(BaseModel):
     """Response after document upload."""
     message: str = Field(..., description="Upload status message")
     filename: str = Field(..., description="Name of the uploaded file")
-    chunks_created: int = Field(..., description="Number of chunks created from the document")
-    document_ids: list[str] = Field(..., description="List of document IDs created")
+    chunks_created: int = Field(
+        ...,
+        description="Number of chunks stored",
+    )
+    document_ids: list[str] = Field(
+        ...,
+        description=(
+            "IDs of the stored chunks, derived from source filename, page/row and "
+            "chunk text; unchanged chunks of a re-upload reuse their IDs, and "
+            "chunks of earlier versions are not removed"
+        ),
+    )
 
 
 class DocumentInfo(BaseModel):
@@ -28,15 +28,37 @@ class Settings(BaseSettings):
     # Document Processing Settings
     chunk_size: int = 1000
     chunk_overlap: int = 200
+    pdf_parallel_min_pages: int = 16
+    pdf_max_workers: int = 2
+    max_upload_bytes: int = 50 * 1024 * 1024
 
     # Model Configuration
     embedding_model: str = "text-embedding-3-small"
     llm_model: str = "gpt-4o-mini"
     llm_temperature: float = 0.0
 
+    # Embedding Cache Settings
+    embedding_cache_size: int = 10000
+
+    # Embedding Batching Settings
+    embedding_batch_size: int = 256
+    embedding_batch_wait_ms: float = 10.0
+    embedding_max_connections: int = 64
+    embedding_max_keepalive_connections: int = 32
+
     # Retrieval Settings
     retrieval_k: int = 4
 
+    # Answer Cache Settings
+    answer_cache_size: int = 1024
+    answer_cache_similarity_threshold: float | None = None  # e.g. 0.95 to enable paraphrase hits
+    answer_cache_ttl_seconds: float | None = 300.0  # Bounds staleness on instances not handling the upload
+
+    # Vector Storage Settings
+    enable_scalar_quantization: bool = True
+    ingest_batch_size: int = 128
+    collection_info_ttl_seconds: float = 1.0
+
     # Logging
     log_level: str = "INFO"
 
@@ -51,6 +73,8 @@ class Settings(BaseSettings):
     # API Settings
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    enable_startup_warmup: bool = True
+    startup_warmup_timeout_seconds: float = 5.0
 
     # Application Info
     app_name: str = "RAG Q&A System"
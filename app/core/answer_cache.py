@@ -0,0 +1,328 @@
+"""Answer cache for RAG queries with exact and semantic lookup"""
+
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+from threading import Lock
+from typing import Any
+
+import numpy as np
+
+from app.config import get_settings
+from app.core.vector_store import EMBEDDING_DIMENSION
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SemanticIndex:
+    """Locality-sensitive hash index for finding near-duplicate unit vectors.
+
+    Each vector is hashed into several tables using random-projection
+    signatures. Lookups score only the vectors that share a bucket with the
+    query, using a single matrix-vector product.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        maxsize: int,
+        threshold: float = 0.95,
+        num_tables: int = 8,
+        num_bits: int = 16,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            dim: Dimension of the indexed vectors
+            maxsize: Maximum number of vectors to keep
+            threshold: Minimum cosine similarity for a match
+            num_tables: Number of hash tables
+            num_bits: Signature bits per table
+            seed: Seed for the random projections
+        """
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.num_tables = num_tables
+        self.num_bits = num_bits
+
+        rng = np.random.default_rng(seed)
+        self._projections = rng.standard_normal((dim, num_tables * num_bits)).astype(np.float32)
+        self._bit_weights = 1 << np.arange(num_bits, dtype=np.int64)
+        self._buckets: list[dict[int, list[str]]] = [{} for _ in range(num_tables)]
+        self._vectors: OrderedDict[str, tuple[np.ndarray, list[int]]] = OrderedDict()
+
+    def _signatures(self, vector: np.ndarray) -> list[int]:
+        """Hash a vector to one signature per table."""
+        bits = (vector @ self._projections).reshape(self.num_tables, self.num_bits) > 0
+        return (bits @ self._bit_weights).tolist()
+
+    def add(self, key: str, vector: list[float]) -> None:
+        """Index a vector under a key, evicting the least recently used if full.
+
+        Args:
+            key: Key to return on a match
+            vector: Unit-norm vector
+        """
+        if key in self._vectors:
+            self._vectors.move_to_end(key)
+            return
+
+        vector = np.asarray(vector, dtype=np.float32)
+        signatures = self._signatures(vector)
+        for table, signature in zip(self._buckets, signatures):
+            table.setdefault(signature, []).append(key)
+        self._vectors[key] = (vector, signatures)
+
+        if len(self._vectors) > self.maxsize:
+            self.remove(next(iter(self._vectors)))
+
+    def remove(self, key: str) -> None:
+        """Remove a key from the vector store and every bucket, if present.
+
+        Args:
+            key: Key to remove
+        """
+        if key not in self._vectors:
+            return
+
+        _, signatures = self._vectors.pop(key)
+        for table, signature in zip(self._buckets, signatures):
+            bucket = table[signature]
+            bucket.remove(key)
+            if not bucket:
+                del table[signature]
+
+    def query(
+        self,
+        vector: list[float],
+        accept: Callable[[str], bool] | None = None,
+    ) -> str | None:
+        """Find the key of the most similar indexed vector above the threshold.
+
+        Args:
+            vector: Unit-norm query vector
+            accept: Only consider keys for which this returns True (Optional)
+
+        Returns:
+            Matching key, or None if nothing is similar enough
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        candidates = [
+            key
+            for key in dict.fromkeys(
+                key
+                for table, signature in zip(self._buckets, self._signatures(vector))
+                for key in table.get(signature, ())
+            )
+            if accept is None or accept(key)
+        ]
+        if not candidates:
+            return None
+
+        scores = np.stack([self._vectors[key][0] for key in candidates]) @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+
+        key = candidates[best]
+        self._vectors.move_to_end(key)
+        return key
+
+    def clear(self) -> None:
+        """Remove all indexed vectors."""
+        self._vectors.clear()
+        for table in self._buckets:
+            table.clear()
+
+
+class AnswerCache:
+    """LRU cache of query responses keyed by normalized question.
+
+    Exact repeats are matched by a hash of the question. Paraphrases can
+    optionally be matched through a SemanticIndex over the question
+    embeddings; this is off unless a similarity threshold is given, since a
+    near-identical question (e.g. a different year or entity) can need a
+    different answer.
+
+    Every clear() starts a new generation. A query captures the generation
+    before it retrieves, and put() drops its response if the cache was
+    cleared in the meantime, so an answer built from pre-upload context is
+    never stored afterwards. Entries also expire after ttl_seconds, which
+    bounds staleness on instances that did not handle the upload themselves.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        similarity_threshold: float | None = None,
+        dim: int = EMBEDDING_DIMENSION,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of responses to keep
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+                (None disables semantic matching)
+            dim: Dimension of the question embeddings
+            ttl_seconds: Seconds a response stays valid (None for no expiry)
+        """
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._index = (
+            SemanticIndex(dim, maxsize=maxsize, threshold=similarity_threshold)
+            if similarity_threshold is not None
+            else None
+        )
+        self._generation = 0
+        self._lock = Lock()
+
+    @property
+    def semantic_enabled(self) -> bool:
+        """Whether paraphrase matching is enabled."""
+        return self._index is not None
+
+    @property
+    def generation(self) -> int:
+        """Number of times the cache has been cleared."""
+        return self._generation
+
+    @staticmethod
+    def _question_key(question: str) -> str:
+        """Build the key for a normalized question."""
+        return hashlib.blake2b(question.strip().lower().encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _entry_key(question_key: str, include_sources: bool) -> str:
+        """Build the key for a response variant of a question."""
+        return question_key + str(int(include_sources))
+
+    def _is_live(self, key: str) -> bool:
+        """Whether a response is cached under key and has not expired."""
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def _get(self, key: str) -> Any | None:
+        """Return a live cached response and mark it as recently used."""
+        if not self._is_live(key):
+            if key in self._entries:
+                self._discard(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return self._entries[key][0]
+
+    def get(self, question: str, include_sources: bool) -> Any | None:
+        """Look up a response for an exact (normalized) question.
+
+        Args:
+            question: User question
+            include_sources: Whether the response includes sources
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        key = self._entry_key(self._question_key(question), include_sources)
+        with self._lock:
+            return self._get(key)
+
+    def get_similar(self, embedding: list[float], include_sources: bool) -> Any | None:
+        """Look up a response for a previously answered, near-identical question.
+
+        Args:
+            embedding: Unit-norm embedding of the question
+            include_sources: Whether the response includes sources
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        if self._index is None:
+            return None
+
+        with self._lock:
+            # Only score questions whose response variant is still cached
+            question_key = self._index.query(
+                embedding,
+                accept=lambda key: self._is_live(self._entry_key(key, include_sources)),
+            )
+            if question_key is None:
+                return None
+            return self._get(self._entry_key(question_key, include_sources))
+
+    def put(
+        self,
+        question: str,
+        include_sources: bool,
+        value: Any,
+        embedding: list[float] | None = None,
+        generation: int | None = None,
+    ) -> None:
+        """Store a response, evicting the least recently used entry if full.
+
+        Args:
+            question: User question
+            include_sources: Whether the response includes sources
+            value: Response to cache
+            embedding: Unit-norm embedding of the question (Optional)
+            generation: Generation captured before the response was built;
+                the write is dropped if the cache was cleared since (Optional)
+        """
+        question_key = self._question_key(question)
+        key = self._entry_key(question_key, include_sources)
+        expires_at = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else math.inf
+        )
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                logger.debug("Dropping answer built before the cache was cleared")
+                return
+
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+            if embedding is not None and self._index is not None:
+                self._index.add(question_key, embedding)
+
+    def _discard(self, key: str) -> None:
+        """Remove a response and prune its question from the index if unused."""
+        del self._entries[key]
+        if self._index is None:
+            return
+
+        question_key = key[:-1]
+        if not any(
+            self._entry_key(question_key, include_sources) in self._entries
+            for include_sources in (False, True)
+        ):
+            self._index.remove(question_key)
+
+    def clear(self) -> None:
+        """Remove all cached responses and start a new generation."""
+        with self._lock:
+            self._entries.clear()
+            if self._index is not None:
+                self._index.clear()
+            self._generation += 1
+        logger.info("Answer cache cleared")
+
+
+@lru_cache
+def get_answer_cache() -> AnswerCache:
+    """Get the shared AnswerCache instance.
+
+    Returns:
+        AnswerCache: Instance configured from settings
+    """
+    settings = get_settings()
+    return AnswerCache(
+        maxsize=settings.answer_cache_size,
+        similarity_threshold=settings.answer_cache_similarity_threshold,
+        ttl_seconds=settings.answer_cache_ttl_seconds,
+    )
@@ -1,27 +1,207 @@
+import math
+import multiprocessing
+import os
 import tempfile
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from threading import Lock
 from typing import BinaryIO
 
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 from langchain_community.document_loaders import (
-    PyPDFLoader,
     CSVLoader,
     TextLoader,
 )
+from pypdf import PdfReader
 
 from app.config import get_settings
+from app.core.text_splitter import SeparatorTextSplitter
 from app.utils.logger import get_logger
 
 
 logger = get_logger(__name__)
 
+UPLOAD_COPY_BUFFER_SIZE = 1024 * 1024  # Copy uploads to disk in 1 MiB chunks
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+def _copy_upload(source: BinaryIO, target: BinaryIO, max_bytes: int | None) -> None:
+    """Copy an upload in chunks, stopping as soon as it exceeds max_bytes.
+
+    Args:
+        source: Uploaded file object
+        target: File to copy into
+        max_bytes: Maximum allowed upload size in bytes (None for no limit)
+    """
+    size = 0
+    while chunk := source.read(UPLOAD_COPY_BUFFER_SIZE):
+        size += len(chunk)
+        if max_bytes is not None and size > max_bytes:
+            raise UploadTooLargeError(f"File exceeds maximum upload size of {max_bytes} bytes")
+        target.write(chunk)
+
+
+def _read_pdf_pages(reader: PdfReader, start: int, stop: int) -> list[tuple[int, str]]:
+    """Extract text from a range of pages of an open PDF.
+
+    Args:
+        reader: Open PDF reader
+        start: Index of the first page to extract
+        stop: Index after the last page to extract
+    Returns:
+        List of (page index, page text) tuples
+    """
+    return [
+        (index, reader.pages[index].extract_text().strip())
+        for index in range(start, stop)
+    ]
+
+
+def _extract_pdf_pages(file_path: str, start: int, stop: int) -> list[tuple[int, str]]:
+    """Extract text from a range of PDF pages.
+
+    Runs in a worker process, so it re-opens the PDF rather than sharing a reader.
+
+    Args:
+        file_path: Path to the PDF file
+        start: Index of the first page to extract
+        stop: Index after the last page to extract
+    Returns:
+        List of (page index, page text) tuples
+    """
+    return _read_pdf_pages(PdfReader(file_path), start, stop)
+
+
+def _pdf_metadata(reader: PdfReader, source: str, total_pages: int) -> dict:
+    """Build document-level PDF metadata in the same shape PyPDFLoader emits.
+
+    Args:
+        reader: Open PDF reader
+        source: Source path recorded in the metadata
+        total_pages: Number of pages in the PDF
+    Returns:
+        Metadata dictionary shared by every page of the PDF
+    """
+    raw_metadata = {"producer": "PyPDF", "creator": "PyPDF", "creationdate": ""}
+    raw_metadata |= dict(reader.metadata or {})
+
+    metadata = {}
+    for key, value in raw_metadata.items():
+        key = key.removeprefix("/").lower()
+        if type(value) not in (str, int):
+            value = str(value)
+        if key in ("creationdate", "moddate"):
+            try:
+                value = datetime.strptime(
+                    value.replace("'", ""), "D:%Y%m%d%H%M%S%z"
+                ).isoformat("T")
+            except ValueError:
+                pass
+        elif isinstance(value, str):
+            value = value.strip()
+        metadata[key] = value
+
+    metadata["source"] = source
+    metadata["total_pages"] = total_pages
+    return metadata
+
+
+def _pdf_worker_count() -> int:
+    """Number of PDF extraction workers, capped by settings.pdf_max_workers."""
+    # os.cpu_count() reports host cores, not the container's CPU quota
+    return max(1, min(get_settings().pdf_max_workers, os.cpu_count() or 1))
+
+
+_pdf_executor: ProcessPoolExecutor | None = None
+_pdf_executor_lock = Lock()
+
+
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """Get the process pool used for parallel PDF text extraction.
+
+    Returns:
+        ProcessPoolExecutor: Pool with a capped number of workers
+    """
+    global _pdf_executor
+    # Locked so concurrent first calls cannot each spawn a pool
+    with _pdf_executor_lock:
+        if _pdf_executor is None:
+            # Spawn rather than fork: the server process is multi-threaded
+            _pdf_executor = ProcessPoolExecutor(
+                max_workers=_pdf_worker_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pdf_executor
+
+
+def _reset_pdf_executor(executor: ProcessPoolExecutor) -> None:
+    """Discard a broken PDF process pool so the next call builds a fresh one.
+
+    Does nothing if another caller has already replaced the pool, so a
+    healthy replacement is never shut down under a concurrent upload.
+
+    Args:
+        executor: Pool that raised BrokenProcessPool
+    """
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is not executor:
+            return
+        _pdf_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pdf_executor() -> None:
+    """Shut down the PDF process pool, waiting for its workers to exit."""
+    global _pdf_executor
+    with _pdf_executor_lock:
+        executor, _pdf_executor = _pdf_executor, None
+    if executor is not None:
+        executor.shutdown(cancel_futures=True)
+
+
+def _extract_pdf_pages_parallel(file_path: str, total_pages: int) -> list[tuple[int, str]]:
+    """Extract all PDF pages across the process pool.
+
+    Args:
+        file_path: Path to the PDF file
+        total_pages: Number of pages in the PDF
+    Returns:
+        List of (page index, page text) tuples in page order
+    Raises:
+        BrokenProcessPool: If a worker died; the broken pool is discarded first
+    """
+    # Give each worker one contiguous range so the PDF is parsed once per worker
+    pages_per_worker = math.ceil(total_pages / _pdf_worker_count())
+    executor = get_pdf_executor()
+    try:
+        futures = [
+            executor.submit(
+                _extract_pdf_pages,
+                file_path,
+                start,
+                min(start + pages_per_worker, total_pages),
+            )
+            for start in range(0, total_pages, pages_per_worker)
+        ]
+        return sorted(page for future in futures for page in future.result())
+    except BrokenProcessPool:
+        _reset_pdf_executor(executor)
+        raise
+
 
 class DocumentProcessor:
     """Process documenets for the RAG pipeline."""
 
-    SUPPORTED_EXTENSIONS = {".txt", ".pdf", ".csv"}
+    SUPPORTED_EXTENSIONS = frozenset({".txt", ".pdf", ".csv"})
 
     def __init__(self, chunk_size: int | None = None, chunk_overlap: int | None = None) -> None:
         """Initialize DocumentProcessor.
@@ -45,11 +225,9 @@ class DocumentProcessor:
     def _initialize_text_splitter(self):
         """Initialize the text splitter with chunk size and overlap."""
 
-        return RecursiveCharacterTextSplitter(
+        return SeparatorTextSplitter(
             chunk_size=self.chunk_size,
             chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
         )
 
 
@@ -64,8 +242,34 @@ class DocumentProcessor:
         file_path = Path(file_path)
         logger.info(f"Loading PDF document from: {file_path}")
 
-        loader = PyPDFLoader(str(file_path))
-        documents = loader.load()
+        reader = PdfReader(file_path)
+        total_pages = len(reader.pages)
+        page_labels = reader.page_labels
+        metadata = _pdf_metadata(reader, str(file_path), total_pages)
+
+        if total_pages < get_settings().pdf_parallel_min_pages:
+            pages = _read_pdf_pages(reader, 0, total_pages)
+        else:
+            try:
+                pages = _extract_pdf_pages_parallel(str(file_path), total_pages)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); retry once on a fresh pool
+                logger.warning("PDF worker pool is broken, recreating it")
+                try:
+                    pages = _extract_pdf_pages_parallel(str(file_path), total_pages)
+                except BrokenProcessPool:
+                    raise RuntimeError(f"PDF extraction workers crashed on: {file_path}")
+
+        documents = [
+            Document(
+                page_content=text,
+                metadata=metadata | {
+                    "page": index,
+                    "page_label": page_labels[index],
+                },
+            )
+            for index, text in pages
+        ]
 
         logger.info(f"Loaded {len(documents)} pages from PDF: {file_path}")
         return documents
@@ -118,19 +322,20 @@ class DocumentProcessor:
         file_path = Path(file_path)
         extension = file_path.suffix.lower()
 
-        if extension not in self.SUPPORTED_EXTENSIONS:
-            raise ValueError(
-                f"Unsupported file extension: {extension}. "
-                f"Supported: {self.SUPPORTED_EXTENSIONS}"
-            )
-
         loaders = {
             ".pdf": self.load_pdf,
             ".txt": self.load_text,
             ".csv": self.load_csv,
         }
 
-        return loaders[extension](file_path)
+        loader = loaders.get(extension)
+        if loader is None:
+            raise ValueError(
+                f"Unsupported file extension: {extension}. "
+                f"Supported: {', '.join(sorted(self.SUPPORTED_EXTENSIONS))}"
+            )
+
+        return loader(file_path)
 
 
     def split_documents(self, documents: list[Document]) -> list[Document]:
@@ -141,12 +346,24 @@ class DocumentProcessor:
         Returns:
             List of chunked Document objects
         """
-        logger.info(f"Splitting {len(documents)} documents into chunks.")
-        chunked_docs = self.text_splitter.split_documents(documents)
+        chunked_docs = list(self.iter_split_documents(documents))
         logger.info(f"Created {len(chunked_docs)} chunks from documents.")
         return chunked_docs
 
 
+    def iter_split_documents(self, documents: list[Document]) -> Iterator[Document]:
+        """Lazily split documents into smaller chunks, one document at a time.
+
+        Args:
+            documents: List of Document objects
+        Yields:
+            Chunked Document objects
+        """
+        logger.info(f"Splitting {len(documents)} documents into chunks.")
+        for document in documents:
+            yield from self.text_splitter.split_documents([document])
+
+
     def process_file(self, file_path: str | Path) -> list[Document]:
         """Load and process a file into chunked documents.
 
@@ -160,30 +377,51 @@ class DocumentProcessor:
         return chunked_documents
 
 
-    def load_from_uploaded_file(self, file: BinaryIO, filename: str) -> list[Document]:
+    def load_from_uploaded_file(
+        self,
+        file: BinaryIO,
+        filename: str,
+        max_bytes: int | None = None,
+    ) -> list[Document]:
         """Load and process an uploaded file into chunked documents.
 
         Args:
             file: Uploaded file object
             filename: Name of the uploaded file
+            max_bytes: Maximum allowed upload size in bytes (Optional)
         Returns:
             List of chunked Document objects
+        Raises:
+            UploadTooLargeError: If the upload is larger than max_bytes
         """
         extension = Path(filename).suffix.lower()
 
         if extension not in self.SUPPORTED_EXTENSIONS:
             raise ValueError(
                 f"Unsupported file extension: {extension}. "
-                f"Supported: {self.SUPPORTED_EXTENSIONS}"
+                f"Supported: {', '.join(sorted(self.SUPPORTED_EXTENSIONS))}"
             )
 
-        # Save to temporary file on disk for processing
+        # Plain text needs no loader, so skip the round-trip through disk
+        if extension == ".txt":
+            data = file.read() if max_bytes is None else file.read(max_bytes + 1)
+            if max_bytes is not None and len(data) > max_bytes:
+                raise UploadTooLargeError(f"File exceeds maximum upload size of {max_bytes} bytes")
+            text = data.decode("utf-8")
+            logger.info(f"Loaded text document from upload: {filename}")
+            return [Document(page_content=text, metadata={"source": filename})]
+
+        # Stream to temporary file on disk for processing
         with tempfile.NamedTemporaryFile(
             delete=False,
             suffix=extension,
         ) as tmp_file:
-            tmp_file.write(file.read())
             tmp_path = tmp_file.name
+            try:
+                _copy_upload(file, tmp_file, max_bytes)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
 
         try:
             documents = self.load_file(tmp_path)
@@ -209,4 +447,14 @@ class DocumentProcessor:
         """
         documents = self.load_from_uploaded_file(file, filename)
         chunked_documents = self.split_documents(documents)
-        return chunked_documents
\ No newline at end of file
+        return chunked_documents
+
+
+@lru_cache
+def get_document_processor() -> DocumentProcessor:
+    """Get the shared DocumentProcessor instance.
+
+    Returns:
+        DocumentProcessor: Instance configured from settings
+    """
+    return DocumentProcessor()
\ No newline at end of file
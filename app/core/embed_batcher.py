@@ -0,0 +1,134 @@
+"""Dynamic batching of concurrent embedding requests"""
+
+import asyncio
+
+from langchain_core.embeddings import Embeddings
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent embedding calls into size-capped batches.
+
+    Callers place their texts on a queue and await a future. A background
+    task collects queued requests until either ``max_batch_size`` texts have
+    accumulated or ``max_wait_ms`` has elapsed, sends them to the embedding
+    model in a single call and hands each caller back its slice of the result.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_batch_size: int = 256,
+        max_wait_ms: float = 10.0,
+    ) -> None:
+        """Initialize the batcher.
+
+        Args:
+            embeddings: Underlying embedding model
+            max_batch_size: Maximum number of texts per embedding call
+            max_wait_ms: Maximum time to wait for a batch to fill up
+        """
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, sharing embedding calls with concurrent callers.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embedding vectors in the same order as the input
+        """
+        if not texts:
+            return []
+
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+
+        # Split oversized requests so a single upload cannot exceed the cap
+        futures = []
+        for start in range(0, len(texts), self.max_batch_size):
+            future = loop.create_future()
+            await self._queue.put((texts[start:start + self.max_batch_size], future))
+            futures.append(future)
+
+        results = await asyncio.gather(*futures)
+        return [embedding for result in results for embedding in result]
+
+    def _ensure_worker(self) -> None:
+        """Start the collector task on the running event loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._collect())
+
+    async def aclose(self) -> None:
+        """Stop the collector task and any batches still being embedded."""
+        tasks = [task for task in (self._worker, *self._flushes) if task is not None]
+        # Tasks from an event loop that has since closed cannot be awaited
+        if self._loop is asyncio.get_running_loop():
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker = None
+        self._queue = None
+        self._loop = None
+
+    async def _collect(self) -> None:
+        """Drain the queue into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        carry = None
+
+        while True:
+            pending = [carry or await self._queue.get()]
+            carry = None
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if size + len(item[0]) > self.max_batch_size:
+                    carry = item
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            # Dispatch without blocking so the next batch can start filling
+            task = loop.create_task(self._flush(pending))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, pending: list[tuple[list[str], asyncio.Future]]) -> None:
+        """Embed one batch and fan the results back out to the callers."""
+        batch = [text for texts, _ in pending for text in texts]
+        logger.debug(f"Embedding batch of {len(batch)} texts from {len(pending)} requests")
+
+        try:
+            embeddings = await self.embeddings.aembed_documents(batch)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for texts, future in pending:
+            if not future.done():
+                future.set_result(embeddings[offset:offset + len(texts)])
+            offset += len(texts)
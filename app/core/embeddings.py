@@ -1,10 +1,17 @@
 """Embedding generation module using OpenAI embeddings"""
 
+import hashlib
+from collections import OrderedDict
 from functools import lru_cache
+from threading import Lock
 
+import httpx
+import numpy as np
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
 
 from app.config import get_settings
+from app.core.embed_batcher import EmbeddingBatcher
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -18,18 +25,182 @@ def get_embedding_model() -> OpenAIEmbeddings:
     """
     settings = get_settings()
     logger.info(f"Initializing OpenAI Embedding Model: {settings.embedding_model}")
+    # Pooled async client so concurrent embedding batches overlap on the wire
+    http_async_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.embedding_max_connections,
+            max_keepalive_connections=settings.embedding_max_keepalive_connections,
+        ),
+    )
     embedding_model = OpenAIEmbeddings(
         model=settings.embedding_model,
         openai_api_key=settings.openai_api_key,
+        http_async_client=http_async_client,
     )
     return embedding_model
 
+
+def normalize_embeddings(embeddings: list[list[float]]) -> list[list[float]]:
+    """Scale embedding vectors to unit length.
+
+    Args:
+        embeddings: Embedding vectors
+
+    Returns:
+        Unit-norm embedding vectors
+    """
+    if not embeddings:
+        return []
+
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.maximum(norms, np.finfo(np.float32).tiny)
+    return vectors.tolist()
+
+
+@lru_cache
+def get_cached_embedding_model() -> "CachedEmbeddings":
+    """Get the OpenAI embedding model wrapped with the query embedding cache.
+
+    Returns:
+        CachedEmbeddings: Shared caching wrapper around the embedding model
+    """
+    settings = get_settings()
+    embedding_model = get_embedding_model()
+    batcher = EmbeddingBatcher(
+        embedding_model,
+        max_batch_size=settings.embedding_batch_size,
+        max_wait_ms=settings.embedding_batch_wait_ms,
+    )
+    return CachedEmbeddings(
+        embedding_model,
+        maxsize=settings.embedding_cache_size,
+        batcher=batcher,
+    )
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that memoizes query embeddings in an LRU cache.
+
+    Repeated questions (after whitespace and case normalization) are served
+    from memory instead of making another round-trip to OpenAI. Document
+    embeddings are passed straight through since uploaded chunks rarely repeat.
+    Async calls go through an optional EmbeddingBatcher so concurrent queries
+    and uploads share embedding requests. All vectors are returned unit-norm
+    so the collection can use dot-product distance.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        maxsize: int = 10000,
+        batcher: EmbeddingBatcher | None = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            embeddings: Underlying embedding model
+            maxsize: Maximum number of query embeddings to keep
+            batcher: Batcher used for async embedding calls (Optional)
+        """
+        self.embeddings = embeddings
+        self.maxsize = maxsize
+        self.batcher = batcher
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        """Build the cache key for a query text."""
+        return hashlib.blake2b(text.strip().lower().encode(), digest_size=16).hexdigest()
+
+    def _get(self, key: str) -> list[float] | None:
+        """Return a cached embedding and mark it as recently used."""
+        with self._lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+            return embedding
+
+    def _put(self, key: str, embedding: list[float]) -> None:
+        """Store an embedding, evicting the least recently used entry if full."""
+        with self._lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed a query, using the cache when possible.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector
+        """
+        key = self._cache_key(text)
+        embedding = self._get(key)
+        if embedding is not None:
+            logger.debug("Query embedding cache hit")
+            return embedding
+
+        embedding = normalize_embeddings([self.embeddings.embed_query(text)])[0]
+        self._put(key, embedding)
+        return embedding
+
+    async def aembed_query(self, text: str) -> list[float]:
+        """Embed a query asynchronously, using the cache when possible.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector
+        """
+        key = self._cache_key(text)
+        embedding = self._get(key)
+        if embedding is not None:
+            logger.debug("Query embedding cache hit")
+            return embedding
+
+        if self.batcher is not None:
+            embedding = (await self.batcher.embed([text]))[0]
+        else:
+            embedding = await self.embeddings.aembed_query(text)
+        embedding = normalize_embeddings([embedding])[0]
+        self._put(key, embedding)
+        return embedding
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed a list of documents without caching."""
+        return normalize_embeddings(self.embeddings.embed_documents(texts))
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed a list of documents asynchronously without caching."""
+        if self.batcher is not None:
+            embeddings = await self.batcher.embed(texts)
+        else:
+            embeddings = await self.embeddings.aembed_documents(texts)
+        return normalize_embeddings(embeddings)
+
+    def clear(self) -> None:
+        """Remove all cached query embeddings."""
+        with self._lock:
+            self._cache.clear()
+
+    async def aclose(self) -> None:
+        """Stop the embedding batcher's background tasks, if any."""
+        if self.batcher is not None:
+            await self.batcher.aclose()
+
+
 class EmbeddingService:
     """Service for generating embeddings."""
 
     def __init__(self) -> None:
         """Initialize the EmbeddingService with cached embedding model."""
-        self.embedding_model = get_embedding_model()
+        self.embedding_model = get_cached_embedding_model()
         logger.info("EmbeddingService initialized with OpenAI Embedding Model.")
 
     def generate_query_embedding(self, text: str) -> list[float]:
@@ -56,4 +227,4 @@ class EmbeddingService:
         """
         embeddings = self.embedding_model.embed_documents(texts)
         logger.debug(f"Generated embeddings for {len(embeddings)} texts.")
-        return embeddings
\ No newline at end of file
+        return embeddings
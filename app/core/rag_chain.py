@@ -1,5 +1,9 @@
 """RAG chain module using LangChain LCEL"""
 
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from typing import Any
+
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
@@ -8,7 +12,8 @@ from langchain_openai import ChatOpenAI
 
 from app.utils.logger import get_logger
 from app.config import get_settings
-from app.core.vector_store import VectorStoreService
+from app.core.answer_cache import get_answer_cache
+from app.core.vector_store import VectorStoreService, get_vector_store
 
 settings = get_settings()
 logger = get_logger(__name__)
@@ -50,6 +55,7 @@ class RAGChain:
         """
         self.vector_store = vector_store_service or VectorStoreService()
         self.retriever = self.vector_store.get_retriever()
+        self.answer_cache = get_answer_cache()
 
         self._evaluator = None
         self.llm = ChatOpenAI(
@@ -75,6 +81,50 @@ class RAGChain:
             f"retrieval_k={settings.retrieval_k}"
         )
     
+    async def aget_cached_response(
+        self, question: str, include_sources: bool
+    ) -> tuple[Any | None, int]:
+        """Look up a cached response for the question or a near-identical one.
+
+        Args:
+            question: User question
+            include_sources: Whether the response includes sources
+
+        Returns:
+            Tuple of the cached response (None on a miss) and the cache
+            generation to pass back to acache_response
+        """
+        # Captured before retrieval so a clear() during generation voids the answer
+        generation = self.answer_cache.generation
+        response = self.answer_cache.get(question, include_sources)
+        if response is None and self.answer_cache.semantic_enabled:
+            # Served from the embedding cache when the retriever runs on a miss
+            embedding = await self.vector_store.embeddings.aembed_query(question)
+            response = self.answer_cache.get_similar(embedding, include_sources)
+        if response is not None:
+            logger.info(f"Answer cache hit for: {question[:100]}")
+        return response, generation
+
+    async def acache_response(
+        self,
+        question: str,
+        include_sources: bool,
+        response: Any,
+        generation: int,
+    ) -> None:
+        """Cache a response for the question.
+
+        Args:
+            question: User question
+            include_sources: Whether the response includes sources
+            response: Response to cache
+            generation: Cache generation returned by aget_cached_response
+        """
+        embedding = None
+        if self.answer_cache.semantic_enabled:
+            embedding = await self.vector_store.embeddings.aembed_query(question)
+        self.answer_cache.put(question, include_sources, response, embedding, generation)
+
     @property
     def evaluator(self):
         """Get the RAG evaluator instance."""
@@ -176,8 +226,8 @@ class RAGChain:
             # Get answer
             answer = await self.chain.ainvoke(question)
 
-            # Get source documents (sync operation)
-            source_docs = self.retriever.invoke(question)
+            # Get source documents (served from the embedding cache after the chain)
+            source_docs = await self.retriever.ainvoke(question)
 
             # Format sources
             sources = [
@@ -252,13 +302,31 @@ class RAGChain:
         except Exception as e:
             logger.error(f"Error streaming query: {e}")
             raise
-    
-    
-    
 
+    async def astream(self, question: str) -> AsyncIterator[str]:
+        """Stream RAG response asynchronously.
 
-    
+        Args:
+            question: User question
 
-        
+        Yields:
+            Response chunks
+        """
+        logger.info(f"Streaming async query: {question[:100]}...")
 
-        
\ No newline at end of file
+        try:
+            async for chunk in self.chain.astream(question):
+                yield chunk
+        except Exception as e:
+            logger.error(f"Error streaming async query: {e}")
+            raise
+
+
+@lru_cache
+def get_rag_chain() -> RAGChain:
+    """Get the shared RAGChain instance.
+
+    Returns:
+        RAGChain: Instance backed by the shared vector store
+    """
+    return RAGChain(vector_store_service=get_vector_store())
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""Bounded-search separator text splitter"""
+
+from typing import Any
+
+from langchain_text_splitters import TextSplitter
+
+# Built once at import and shared by every splitter using the defaults
+DEFAULT_SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+
+class SeparatorTextSplitter(TextSplitter):
+    """Split text on separator boundaries found with bounded str searches.
+
+    Each chunk ends at the furthest boundary of the highest-priority
+    separator that lies within chunk_size characters of its start and past
+    the previous chunk's end, with a hard cut at chunk_size when no such
+    boundary exists. The next chunk starts at the earliest boundary of the
+    separator the chunk was cut on that lies within chunk_overlap characters
+    before its end, falling back to higher-priority separators when that
+    one has none, so overlap stays close to chunk_overlap. A hard cut
+    falls back through every separator and gets no overlap if none fits.
+
+    Only the chunk_size window around each cut is searched, so the cost
+    grows with the number of chunks rather than the number of separators.
+    This approximates RecursiveCharacterTextSplitter rather than replicating
+    it: boundaries and chunk counts can differ. Lengths are always measured
+    in characters.
+    """
+
+    def __init__(self, separators: list[str] | None = None, **kwargs: Any) -> None:
+        """Initialize SeparatorTextSplitter.
+
+        Args:
+            separators: Separators in priority order (defaults to paragraph,
+                line, sentence and word boundaries)
+            **kwargs: Arguments forwarded to TextSplitter (length_function
+                must be left as len)
+        """
+        super().__init__(**kwargs)
+        if self._length_function is not len:
+            raise ValueError("SeparatorTextSplitter only measures length in characters")
+        self._separators = tuple(separators or DEFAULT_SEPARATORS)
+
+    def _find_end(self, text: str, start: int, previous_end: int) -> tuple[int, int]:
+        """Find where the chunk starting at start should end.
+
+        Returns:
+            Tuple of (end offset, rank of the separator cut on), with the
+            rank equal to len(separators) for a hard cut
+        """
+        limit = start + self._chunk_size
+        for rank, separator in enumerate(self._separators):
+            # The boundary must fall after previous_end so every chunk adds new text
+            lower = max(start, previous_end - len(separator) + 1)
+            position = text.rfind(separator, lower, limit)
+            if position >= 0:
+                return position + len(separator), rank
+        return limit, len(self._separators)
+
+    def _find_overlap_start(self, text: str, start: int, end: int, rank: int) -> int:
+        """Find where the chunk after the one ending at end should start."""
+        window_start = max(end - self._chunk_overlap, start + 1)
+        for separator in reversed(self._separators[:rank + 1]):
+            # Boundaries at window_start or later, strictly before end
+            position = text.find(separator, max(window_start - len(separator), 0), end - 1)
+            if position >= 0:
+                return position + len(separator)
+        return end
+
+    def split_text(self, text: str) -> list[str]:
+        """Split text into chunks.
+
+        Args:
+            text: Text to split
+
+        Returns:
+            List of text chunks
+        """
+        chunks = []
+        text_length = len(text)
+        start = 0
+        # Each chunk must extend past the previous one, not just repeat its overlap
+        previous_end = 0
+
+        while start < text_length:
+            if start + self._chunk_size >= text_length:
+                end, rank = text_length, 0
+            else:
+                end, rank = self._find_end(text, start, previous_end)
+
+            chunk = text[start:end]
+            if self._strip_whitespace:
+                chunk = chunk.strip()
+            if chunk:
+                chunks.append(chunk)
+
+            if end >= text_length:
+                break
+
+            previous_end = end
+            start = (
+                self._find_overlap_start(text, start, end, rank)
+                if self._chunk_overlap
+                else end
+            )
+
+        return chunks
@@ -1,24 +1,65 @@
 """Vector store module for Qdrant operations"""
 
-
+import asyncio
+import hashlib
+import time
+from collections.abc import Iterable
 from functools import lru_cache
-from uuid import uuid4
+from itertools import islice
+from uuid import UUID
 from typing import Any
 
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
 from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
 from langchain_qdrant import QdrantVectorStore
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.http.models import (
+    Distance,
+    PointStruct,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    VectorParams,
+)
 from qdrant_client.http.exceptions import UnexpectedResponse
 
 from app.config import get_settings
-from app.core.embeddings import get_embedding_model
+from app.core.embeddings import get_cached_embedding_model
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 EMBEDDING_DIMENSION = 1536  # Dimension for OpenAI text-embedding-3-small embeddings
+DOCUMENT_LOCATOR_KEYS = ("page", "row")  # Metadata that places a chunk within its source
+
+
+def _document_id(document: Document) -> str:
+    """Derive a stable point ID from a document's source, locator and content.
+
+    The locator is the PDF page or CSV row when present, so identical text
+    in different places stays distinct. Re-uploading a file overwrites the
+    points of chunks whose text is unchanged; chunks from earlier versions
+    of the file are left in place.
+
+    Args:
+        document: Document to identify
+
+    Returns:
+        UUID string built from a 128-bit BLAKE2b digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(document.metadata.get("source", "")).encode())
+    for key in DOCUMENT_LOCATOR_KEYS:
+        if key in document.metadata:
+            digest.update(f"\0{key}={document.metadata[key]}".encode())
+    digest.update(b"\0")
+    digest.update(document.page_content.encode())
+    return str(UUID(bytes=digest.digest()))
 
 @lru_cache
 def get_qdrant_client() -> QdrantClient:
@@ -35,44 +76,122 @@ def get_qdrant_client() -> QdrantClient:
     logger.info("Qdrant client initialized successfully.")
     return client
 
+@lru_cache
+def get_async_qdrant_client() -> AsyncQdrantClient:
+    """Get the async Qdrant client instance.
+
+    Returns:
+        AsyncQdrantClient: Instance of the async Qdrant client
+    """
+    logger.info(f"Connecting async client to Qdrant at {settings.qdrant_url}")
+    client = AsyncQdrantClient(
+        url=settings.qdrant_url,
+        api_key=settings.qdrant_api_key,
+    )
+    logger.info("Async Qdrant client initialized successfully.")
+    return client
+
+
+class VectorStoreRetriever(BaseRetriever):
+    """Retriever whose async path embeds through VectorStoreService.asearch_with_scores.
+
+    QdrantVectorStore has no native async search, so its own retriever runs
+    the sync search in an executor and never reaches the embedding batcher.
+    This one sends async queries through aembed_query and the async Qdrant
+    client instead.
+    """
+
+    service: Any
+    k: int
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        """Retrieve documents with the sync search."""
+        return self.service.search(query, k=self.k)
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        """Retrieve documents with the async, batched search."""
+        results = await self.service.asearch_with_scores(query, k=self.k)
+        return [document for document, _ in results]
+
+
 class VectorStoreService:
     """Service for interacting with the Qdrant vector store."""
 
     def __init__(self, collection_name: str | None = None) -> None:
         """Initialize the VectorStoreService with cached Qdrant client."""
         self.client = get_qdrant_client()
+        self.async_client = get_async_qdrant_client()
         self.collection_name = collection_name or settings.collection_name
-        self.embeddings = get_embedding_model()
+        self.embeddings = get_cached_embedding_model()
+        # Cached get_collection_info() result as (info, expires_at)
+        self._collection_info: tuple[dict, float] | None = None
         logger.info("VectorStoreService initialized with Qdrant client.")
 
-        # Ensure the collection exists
-        self._ensure_collection()
+        # Ensure the collection exists and match its configured distance
+        self.distance = self._ensure_collection()
 
         # Intialize Langchain Qdrant vector store
         self.vector_store = QdrantVectorStore(
             client = self.client,
             collection_name = self.collection_name,
-            embedding=self.embeddings
+            embedding=self.embeddings,
+            distance=self.distance,
         )
 
-    def _ensure_collection(self) -> None:
-        """Ensure the collection exists, create if not."""
-        try:
+    def _ensure_collection(self, distance: Distance = Distance.DOT) -> Distance:
+        """Ensure the collection exists, create if not.
+
+        Args:
+            distance: Distance to create a missing collection with
+
+        Returns:
+            Distance the collection is actually configured with
+        """
+        if self.client.collection_exists(self.collection_name):
             collection_info = self.client.get_collection(self.collection_name)
             logger.info(
                 f"Collection '{self.collection_name}' exists with "
                 f"{collection_info.points_count} points"
             )
-        except UnexpectedResponse:
-            logger.info(f"Creating collection: {self.collection_name}")
-            self.client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=VectorParams(
-                    size=EMBEDDING_DIMENSION,
-                    distance=Distance.COSINE, # Cosine distance for similarity search
-                ),
-            )
-            logger.info(f"Collection '{self.collection_name}' created successfully")
+            quantization_config = self._quantization_config()
+            if quantization_config and collection_info.config.quantization_config is None:
+                logger.info(f"Enabling int8 scalar quantization on: {self.collection_name}")
+                self.client.update_collection(
+                    collection_name=self.collection_name,
+                    quantization_config=quantization_config,
+                )
+            # Collections created before the switch to DOT keep their COSINE distance
+            return collection_info.config.params.vectors.distance
+
+        logger.info(f"Creating collection: {self.collection_name}")
+        self.client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config=VectorParams(
+                size=EMBEDDING_DIMENSION,
+                distance=distance, # Dot product on unit-norm embeddings (equals cosine)
+            ),
+            quantization_config=self._quantization_config(),
+        )
+        logger.info(f"Collection '{self.collection_name}' created successfully")
+        return distance
+
+    def _quantization_config(self) -> ScalarQuantization | None:
+        """Build the int8 scalar quantization config, if enabled."""
+        if not settings.enable_scalar_quantization:
+            return None
+
+        # Quantized vectors are kept in RAM for search; originals are used for rescoring
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True,
+            ),
+        )
 
     def add_documents(self, documents: list[Document]) -> list[str]:
         """Add documents to the vector store.
@@ -81,7 +200,8 @@ class VectorStoreService:
             documents: List of Document objects to add
 
         Returns:
-            List of document IDs added to the vector store
+            Unique document IDs stored, in first-seen order (identical
+            chunks on the same page or row share one ID)
         """
         if not documents:
             logger.warning("No documents to add")
@@ -89,15 +209,108 @@ class VectorStoreService:
 
         logger.info(f"Adding {len(documents)} documents to collection")
 
-        # Generate unique IDs for each document
-        ids = [str(uuid4()) for _ in documents]
+        # Derive content-addressed IDs for each document
+        ids = [_document_id(doc) for doc in documents]
 
         # Add to vector store
         self.vector_store.add_documents(documents, ids=ids)
+        self._collection_info = None
+
+        ids = list(dict.fromkeys(ids))
+        logger.info(f"Successfully added {len(ids)} unique documents")
+        return ids
+
+    async def aadd_documents_streaming(
+        self,
+        documents: Iterable[Document],
+        batch_size: int | None = None,
+    ) -> list[str]:
+        """Embed and upsert documents in fixed-size batches as they are produced.
+
+        Only one batch is held in memory at a time, and embedding a batch
+        overlaps with upserting the previous one. Embeddings are generated
+        through the shared embedding batcher, so concurrent uploads and
+        queries are coalesced into fewer OpenAI calls.
+
+        Args:
+            documents: Iterable of Document objects to add (e.g. a chunk generator)
+            batch_size: Number of documents per batch (defaults to settings.ingest_batch_size)
+
+        Returns:
+            Unique document IDs stored, in first-seen order (identical
+            chunks on the same page or row share one ID)
+        """
+        batch_size = batch_size or settings.ingest_batch_size
+        documents = iter(documents)
+        ids: list[str] = []
+        embed_task: asyncio.Future | None = None
+        upsert_task: asyncio.Future | None = None
 
-        logger.info(f"Successfully added {len(documents)} documents")
+        try:
+            # Pull batches in a worker thread since producing chunks is CPU-bound
+            while batch := await asyncio.to_thread(list, islice(documents, batch_size)):
+                # Derive content-addressed IDs for each document
+                batch_ids = [_document_id(doc) for doc in batch]
+                embed_task = asyncio.ensure_future(
+                    self.embeddings.aembed_documents(
+                        [doc.page_content for doc in batch]
+                    )
+                )
+
+                # Embed this batch while the previous upsert finishes; the
+                # first failure of either is raised straight away
+                if upsert_task is None:
+                    vectors = await embed_task
+                else:
+                    vectors, _ = await asyncio.gather(embed_task, upsert_task)
+
+                upsert_task = asyncio.ensure_future(self._aupsert(batch_ids, batch, vectors))
+                ids.extend(batch_ids)
+                logger.debug(f"Queued batch of {len(batch)} documents for upsert")
+
+            if upsert_task is None:
+                logger.warning("No documents to add")
+                return []
+
+            await upsert_task
+        finally:
+            # On failure, stop any in-flight embedding or upsert instead of
+            # leaving it running unawaited
+            pending = [task for task in (embed_task, upsert_task) if task is not None]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            # A cancelled upsert may still have written points
+            self._collection_info = None
+
+        ids = list(dict.fromkeys(ids))
+        logger.info(f"Successfully added {len(ids)} unique documents")
         return ids
 
+    async def _aupsert(
+        self,
+        ids: list[str],
+        documents: list[Document],
+        vectors: list[list[float]],
+    ) -> None:
+        """Upsert one batch of embedded documents into the collection."""
+        points = [
+            PointStruct(
+                id=point_id,
+                vector=vector,
+                payload={
+                    self.vector_store.content_payload_key: doc.page_content,
+                    self.vector_store.metadata_payload_key: doc.metadata,
+                },
+            )
+            for point_id, doc, vector in zip(ids, documents, vectors)
+        ]
+        await self.async_client.upsert(
+            collection_name=self.collection_name,
+            points=points,
+        )
+        self._collection_info = None
+
     def search(self, query: str, k: int | None = None) -> list[Document]:
         """Search the vector store for similar documents.
 
@@ -138,7 +351,50 @@ class VectorStoreService:
         logger.debug(f"Found {len(results)} results with scores")
         return results
 
-    def get_retriever(self, k: int | None = None) -> Any:
+    async def asearch_with_scores(
+        self,
+        query: str,
+        k: int | None = None,
+    ) -> list[tuple[Document, float]]:
+        """Search for similar documents with relevance scores asynchronously.
+
+        Args:
+            query: Search query
+            k: Number of results to return
+
+        Returns:
+            List of (Document, score) tuples
+        """
+        k = k or settings.retrieval_k
+        logger.debug(f"Async searching with scores for: {query[:50]}... (k={k})")
+
+        embedding = await self.embeddings.aembed_query(query)
+        response = await self.async_client.query_points(
+            collection_name=self.collection_name,
+            query=embedding,
+            limit=k,
+            with_payload=True,
+        )
+        results = [
+            (self._document_from_point(point), point.score)
+            for point in response.points
+        ]
+
+        logger.debug(f"Found {len(results)} results with scores")
+        return results
+
+    def _document_from_point(self, point: Any) -> Document:
+        """Build a Document from a Qdrant point, matching QdrantVectorStore's layout."""
+        payload = point.payload or {}
+        metadata = dict(payload.get(self.vector_store.metadata_payload_key) or {})
+        metadata["_id"] = point.id
+        metadata["_collection_name"] = self.collection_name
+        return Document(
+            page_content=payload.get(self.vector_store.content_payload_key, ""),
+            metadata=metadata,
+        )
+
+    def get_retriever(self, k: int | None = None) -> VectorStoreRetriever:
         """Get a retriever for the vector store.
 
         Args:
@@ -149,31 +405,44 @@ class VectorStoreService:
         """
         k = k or settings.retrieval_k
 
-        return self.vector_store.as_retriever(
-            search_type="similarity",
-            search_kwargs={"k": k},
-        )
+        return VectorStoreRetriever(service=self, k=k)
 
     def delete_collection(self) -> None:
         """Delete the entire collection."""
         logger.warning(f"Deleting collection: {self.collection_name}")
         self.client.delete_collection(self.collection_name)
+        self._collection_info = None
         logger.info(f"Collection '{self.collection_name}' deleted")
 
+        # Recreate an empty collection with the same distance the vector store expects
+        self._ensure_collection(self.distance)
+
     def get_collection_info(self) -> dict:
         """Get information about the collection.
 
+        Results are cached for settings.collection_info_ttl_seconds so that
+        frequent probes and dashboards do not hit Qdrant on every call.
+
         Returns:
             Dictionary with collection statistics
         """
+        cached = self._collection_info
+        if cached is not None and cached[1] > time.monotonic():
+            return dict(cached[0])
+
         try:
             info = self.client.get_collection(self.collection_name)
-            return {
+            collection_info = {
                 "name": self.collection_name,
                 "points_count": info.points_count,
                 "indexed_vectors_count": info.indexed_vectors_count,
                 "status": info.status.value,
             }
+            self._collection_info = (
+                collection_info,
+                time.monotonic() + settings.collection_info_ttl_seconds,
+            )
+            return dict(collection_info)
         except UnexpectedResponse:
             return {
                 "name": self.collection_name,
@@ -193,4 +462,14 @@ class VectorStoreService:
             return True
         except Exception as e:
             logger.error(f"Vector store health check failed: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+@lru_cache
+def get_vector_store() -> VectorStoreService:
+    """Get the shared VectorStoreService instance.
+
+    Returns:
+        VectorStoreService: Instance bound to the configured collection
+    """
+    return VectorStoreService()
\ No newline at end of file
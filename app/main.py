@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -16,10 +17,29 @@ from fastapi.responses import JSONResponse, HTMLResponse
 from app import __version__
 from app.api.routes import documents, query, health
 from app.config import get_settings
+from app.core.document_processor import get_document_processor, shutdown_pdf_executor
+from app.core.embeddings import get_cached_embedding_model, get_embedding_model
+from app.core.rag_chain import get_rag_chain
+from app.core.vector_store import get_vector_store
 from app.utils.logger import get_logger, setup_logging
 
 settings = get_settings()
 
+
+async def warmup() -> None:
+    """Initialize shared services and open upstream connections.
+
+    Keeps model/client initialization, DNS lookups and TLS handshakes to
+    OpenAI and Qdrant out of the first requests after boot. The services
+    are built in a worker thread since their constructors make blocking
+    network calls, which a timeout could not otherwise interrupt.
+    """
+    get_document_processor()
+    vector_store = await asyncio.to_thread(get_vector_store)
+    await asyncio.to_thread(get_rag_chain)
+    await get_embedding_model().aembed_query("warmup")
+    await vector_store.async_client.get_collections()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI app.
@@ -34,9 +54,29 @@ async def lifespan(app: FastAPI):
     setup_logging(settings.log_level)
     logger = get_logger("app.main")
     logger.info(f"Starting RAG Q&A API - version {__version__}")
+    if settings.enable_startup_warmup:
+        try:
+            # Bounded so unreachable upstreams cannot hold up health checks
+            await asyncio.wait_for(warmup(), settings.startup_warmup_timeout_seconds)
+            logger.info("Startup warmup completed")
+        except TimeoutError:
+            logger.warning(
+                f"Startup warmup timed out after {settings.startup_warmup_timeout_seconds}s"
+            )
+        except Exception as e:
+            # Serve anyway; services initialize lazily on first request
+            logger.warning(f"Startup warmup failed: {e}")
     yield
     # Shutdown actions
     logger.info("Shutting down RAG Q&A API")
+    # Skip building the embedding model just to close it
+    if get_cached_embedding_model.cache_info().currsize:
+        await get_cached_embedding_model().aclose()
+    if get_embedding_model.cache_info().currsize:
+        # Release the pooled keep-alive connections to OpenAI
+        await get_embedding_model().http_async_client.aclose()
+    # Stop PDF extraction workers so they do not outlive the app
+    await asyncio.to_thread(shutdown_pdf_executor)
 
 # Create FastAPI application
 app = FastAPI(
@@ -0,0 +1,8 @@
+"""Shared pytest configuration."""
+
+import os
+
+# Settings require credentials; tests never talk to the real services
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("QDRANT_URL", "http://localhost:6333")
+os.environ.setdefault("QDRANT_API_KEY", "test-key")
@@ -0,0 +1,73 @@
+"""Tests for AnswerCache exact and semantic lookup."""
+
+import numpy as np
+
+from app.core import answer_cache
+from app.core.answer_cache import AnswerCache
+
+DIM = 8
+
+
+def _unit(*values: float) -> list[float]:
+    """Build a unit-norm vector padded to DIM."""
+    vector = np.zeros(DIM, dtype=np.float32)
+    vector[:len(values)] = values
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def test_semantic_lookup_disabled_by_default():
+    cache = AnswerCache(maxsize=4, dim=DIM)
+    cache.put("What is RAG?", False, "answer", _unit(1.0))
+
+    assert not cache.semantic_enabled
+    assert cache.get("  what is rag? ", False) == "answer"
+    assert cache.get_similar(_unit(1.0), False) is None
+
+
+def test_semantic_lookup_skips_evicted_entries():
+    cache = AnswerCache(maxsize=2, similarity_threshold=0.9, dim=DIM)
+    cache.put("closest", False, "evicted", _unit(1.0))
+    cache.put("close", False, "kept", _unit(1.0, 0.2))
+    cache.put("other", True, "unrelated", _unit(0.0, 1.0))
+
+    # "closest" scores highest but its response is gone; "close" still matches
+    assert cache.get("closest", False) is None
+    assert cache.get_similar(_unit(1.0), False) == "kept"
+
+
+def test_semantic_lookup_matches_include_sources_variant():
+    cache = AnswerCache(maxsize=4, similarity_threshold=0.9, dim=DIM)
+    cache.put("closest", True, "with sources", _unit(1.0))
+    cache.put("close", False, "without sources", _unit(1.0, 0.2))
+
+    assert cache.get_similar(_unit(1.0), False) == "without sources"
+    assert cache.get_similar(_unit(1.0), True) == "with sources"
+
+
+def test_put_is_dropped_when_cleared_after_lookup():
+    cache = AnswerCache(maxsize=4, dim=DIM)
+
+    generation = cache.generation
+    assert cache.get("What is RAG?", False) is None
+    cache.clear()  # e.g. an upload finishes while the answer is generated
+    cache.put("What is RAG?", False, "stale answer", generation=generation)
+
+    assert cache.get("What is RAG?", False) is None
+
+    generation = cache.generation
+    cache.put("What is RAG?", False, "fresh answer", generation=generation)
+    assert cache.get("What is RAG?", False) == "fresh answer"
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(answer_cache.time, "monotonic", lambda: now)
+    cache = AnswerCache(maxsize=4, similarity_threshold=0.9, dim=DIM, ttl_seconds=60)
+    cache.put("What is RAG?", False, "answer", _unit(1.0))
+
+    now += 59
+    assert cache.get("What is RAG?", False) == "answer"
+
+    now += 2
+    assert cache.get_similar(_unit(1.0), False) is None
+    assert cache.get("What is RAG?", False) is None
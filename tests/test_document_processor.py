@@ -0,0 +1,111 @@
+"""Tests for DocumentProcessor PDF and upload loading."""
+
+import io
+import os
+
+import pytest
+from langchain_community.document_loaders import PyPDFLoader
+from pypdf import PdfReader, PdfWriter
+
+from app.config import get_settings
+from app.core import document_processor
+from app.core.document_processor import (
+    DocumentProcessor,
+    UploadTooLargeError,
+    get_pdf_executor,
+)
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    """Write a small PDF with document-level metadata."""
+    writer = PdfWriter()
+    for _ in range(4):
+        writer.add_blank_page(width=72, height=72)
+    writer.add_metadata({
+        "/Author": "Jane Doe",
+        "/Title": "Quarterly Report",
+        "/CreationDate": "D:20240102030405+00'00'",
+    })
+    path = tmp_path / "report.pdf"
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+@pytest.fixture
+def parallel_pdf(monkeypatch):
+    """Force the process pool path for any PDF."""
+    monkeypatch.setattr(get_settings(), "pdf_parallel_min_pages", 1)
+    yield
+    document_processor.shutdown_pdf_executor()
+
+
+def test_load_pdf_matches_pypdf_loader_metadata(pdf_path):
+    documents = DocumentProcessor().load_pdf(pdf_path)
+    expected = PyPDFLoader(str(pdf_path)).load()
+
+    assert [doc.metadata for doc in documents] == [doc.metadata for doc in expected]
+    assert documents[0].metadata["author"] == "Jane Doe"
+    assert documents[0].metadata["title"] == "Quarterly Report"
+
+
+def test_small_pdf_is_opened_once(pdf_path, monkeypatch):
+    opened = []
+
+    def counting_reader(*args, **kwargs):
+        opened.append(args[0])
+        return PdfReader(*args, **kwargs)
+
+    monkeypatch.setattr(document_processor, "PdfReader", counting_reader)
+
+    documents = DocumentProcessor().load_pdf(pdf_path)
+
+    assert len(documents) == 4
+    assert len(opened) == 1
+
+
+def test_load_pdf_recovers_from_broken_pool(pdf_path, parallel_pdf):
+    # Kill a worker to break the cached pool
+    with pytest.raises(Exception):
+        get_pdf_executor().submit(os._exit, 1).result()
+
+    documents = DocumentProcessor().load_pdf(pdf_path)
+
+    assert [doc.metadata["page"] for doc in documents] == [0, 1, 2, 3]
+
+
+def test_stale_reset_leaves_the_replacement_pool_running(parallel_pdf):
+    broken = get_pdf_executor()
+    document_processor._reset_pdf_executor(broken)
+    replacement = get_pdf_executor()
+
+    # A second upload that saw the same broken pool resets after the first
+    document_processor._reset_pdf_executor(broken)
+
+    assert get_pdf_executor() is replacement
+    assert replacement.submit(abs, -1).result() == 1
+
+
+def test_pdf_worker_count_is_capped(monkeypatch):
+    monkeypatch.setattr(get_settings(), "pdf_max_workers", 2)
+    monkeypatch.setattr(os, "cpu_count", lambda: 64)
+
+    assert document_processor._pdf_worker_count() == 2
+
+
+@pytest.mark.parametrize("filename", ["notes.txt", "table.csv"])
+def test_upload_size_limit_is_enforced_while_reading(filename):
+    processor = DocumentProcessor()
+    data = b"a,b\n" + b"1,2\n" * 16
+
+    documents = processor.load_from_uploaded_file(io.BytesIO(data), filename, len(data))
+    assert documents
+
+    with pytest.raises(UploadTooLargeError):
+        processor.load_from_uploaded_file(io.BytesIO(data), filename, len(data) - 1)
+
+
+def test_unsupported_extension_lists_supported_types():
+    with pytest.raises(ValueError, match=r"Supported: \.csv, \.pdf, \.txt$"):
+        DocumentProcessor().load_from_uploaded_file(io.BytesIO(b""), "slides.pptx")
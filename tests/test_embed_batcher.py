@@ -0,0 +1,105 @@
+"""Tests for EmbeddingBatcher batching and fan-out."""
+
+import asyncio
+
+from langchain_core.embeddings import Embeddings
+
+from app.core.embed_batcher import EmbeddingBatcher
+
+
+class RecordingEmbeddings(Embeddings):
+    """Embed numeric strings as one-element vectors and record every call."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.calls: list[list[str]] = []
+        self.error = error
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [[float(text)] for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return [float(text)]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        if self.error is not None:
+            raise self.error
+        return self.embed_documents(texts)
+
+
+def _vectors(*texts: str) -> list[list[float]]:
+    return [[float(text)] for text in texts]
+
+
+def test_concurrent_calls_share_one_batch_and_get_their_own_slice():
+    embeddings = RecordingEmbeddings()
+    batcher = EmbeddingBatcher(embeddings, max_batch_size=8, max_wait_ms=50)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.embed(["1", "2"]),
+            batcher.embed(["3"]),
+            batcher.embed(["4", "5", "6"]),
+        )
+
+    assert asyncio.run(run()) == [_vectors("1", "2"), _vectors("3"), _vectors("4", "5", "6")]
+    assert embeddings.calls == [["1", "2", "3", "4", "5", "6"]]
+
+
+def test_oversized_request_is_split_at_max_batch_size():
+    embeddings = RecordingEmbeddings()
+    batcher = EmbeddingBatcher(embeddings, max_batch_size=2, max_wait_ms=50)
+
+    result = asyncio.run(batcher.embed(["1", "2", "3", "4", "5"]))
+
+    assert result == _vectors("1", "2", "3", "4", "5")
+    assert embeddings.calls == [["1", "2"], ["3", "4"], ["5"]]
+
+
+def test_request_that_does_not_fit_is_carried_to_the_next_batch():
+    embeddings = RecordingEmbeddings()
+    batcher = EmbeddingBatcher(embeddings, max_batch_size=3, max_wait_ms=50)
+
+    async def run():
+        return await asyncio.gather(batcher.embed(["1", "2"]), batcher.embed(["3", "4"]))
+
+    assert asyncio.run(run()) == [_vectors("1", "2"), _vectors("3", "4")]
+    assert embeddings.calls == [["1", "2"], ["3", "4"]]
+
+
+def test_error_reaches_every_caller_in_the_batch():
+    embeddings = RecordingEmbeddings(error=RuntimeError("embedding failed"))
+    batcher = EmbeddingBatcher(embeddings, max_batch_size=8, max_wait_ms=50)
+
+    async def run():
+        results = await asyncio.gather(
+            batcher.embed(["1"]), batcher.embed(["2"]), return_exceptions=True
+        )
+        # The collector survives a failed batch and keeps serving callers
+        embeddings.error = None
+        return results, await batcher.embed(["3"])
+
+    results, after = asyncio.run(run())
+
+    assert len(embeddings.calls[0]) == 2
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert after == _vectors("3")
+
+
+def test_empty_request_skips_the_model():
+    embeddings = RecordingEmbeddings()
+    batcher = EmbeddingBatcher(embeddings)
+
+    assert asyncio.run(batcher.embed([])) == []
+    assert embeddings.calls == []
+
+
+def test_aclose_leaves_no_pending_tasks():
+    batcher = EmbeddingBatcher(RecordingEmbeddings(), max_wait_ms=50)
+
+    async def run():
+        await batcher.embed(["1"])
+        await batcher.aclose()
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    assert asyncio.run(run()) == set()
@@ -0,0 +1,84 @@
+"""Tests for CachedEmbeddings query caching and normalization."""
+
+import asyncio
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.core.embed_batcher import EmbeddingBatcher
+from app.core.embeddings import CachedEmbeddings
+
+
+class CountingEmbeddings(Embeddings):
+    """Embed texts as non-unit vectors derived from their length and count calls."""
+
+    def __init__(self) -> None:
+        self.query_calls: list[str] = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [[3.0, 4.0 * len(text)] for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        self.query_calls.append(text)
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return self.embed_query(text)
+
+
+def test_query_hits_cache_after_whitespace_and_case_normalization():
+    embeddings = CountingEmbeddings()
+    cache = CachedEmbeddings(embeddings)
+
+    first = cache.embed_query("What is RAG?")
+
+    assert cache.embed_query("  what is rag?\n") == first
+    assert asyncio.run(cache.aembed_query("WHAT IS RAG?")) == first
+    assert embeddings.query_calls == ["What is RAG?"]
+
+
+def test_least_recently_used_query_is_evicted_at_maxsize():
+    embeddings = CountingEmbeddings()
+    cache = CachedEmbeddings(embeddings, maxsize=2)
+
+    cache.embed_query("a")
+    cache.embed_query("b")
+    cache.embed_query("a")  # Refresh "a" so "b" is the oldest
+    cache.embed_query("c")
+    cache.embed_query("a")
+    cache.embed_query("b")
+
+    assert embeddings.query_calls == ["a", "b", "c", "b"]
+
+
+def test_sync_and_async_vectors_are_unit_norm():
+    embeddings = CountingEmbeddings()
+    cache = CachedEmbeddings(embeddings)
+    batched = CachedEmbeddings(embeddings, batcher=EmbeddingBatcher(embeddings))
+
+    async def embed_async():
+        return [
+            await cache.aembed_query("async query"),
+            await batched.aembed_query("batched query"),
+            *await cache.aembed_documents(["async doc"]),
+            *await batched.aembed_documents(["batched doc"]),
+        ]
+
+    vectors = [
+        cache.embed_query("sync query"),
+        *cache.embed_documents(["sync doc", "another doc"]),
+        *asyncio.run(embed_async()),
+    ]
+
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+
+
+def test_clear_drops_cached_queries():
+    embeddings = CountingEmbeddings()
+    cache = CachedEmbeddings(embeddings)
+
+    cache.embed_query("question")
+    cache.clear()
+    cache.embed_query("question")
+
+    assert embeddings.query_calls == ["question", "question"]
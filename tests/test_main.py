@@ -0,0 +1,46 @@
+"""Tests for application startup."""
+
+import asyncio
+import time
+from functools import lru_cache
+from types import SimpleNamespace
+
+import httpx
+
+from app import main
+
+
+def test_startup_is_not_held_up_by_a_hanging_warmup(monkeypatch):
+    async def hanging_warmup():
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(main, "warmup", hanging_warmup)
+    monkeypatch.setattr(main.settings, "enable_startup_warmup", True)
+    monkeypatch.setattr(main.settings, "startup_warmup_timeout_seconds", 0.05)
+
+    async def start():
+        started = time.monotonic()
+        async with main.lifespan(main.app):
+            return time.monotonic() - started
+
+    assert asyncio.run(start()) < 1
+
+
+def test_shutdown_closes_the_embedding_http_client(monkeypatch):
+    http_async_client = httpx.AsyncClient()
+
+    @lru_cache
+    def get_embedding_model():
+        return SimpleNamespace(http_async_client=http_async_client)
+
+    get_embedding_model()
+    monkeypatch.setattr(main, "get_embedding_model", get_embedding_model)
+    monkeypatch.setattr(main.settings, "enable_startup_warmup", False)
+
+    async def run():
+        async with main.lifespan(main.app):
+            pass
+
+    asyncio.run(run())
+
+    assert http_async_client.is_closed
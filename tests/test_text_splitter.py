@@ -0,0 +1,107 @@
+"""Tests for SeparatorTextSplitter packing rules."""
+
+import random
+
+import pytest
+
+from app.core.text_splitter import SeparatorTextSplitter
+
+TEXT = (
+    "Retrieval augmented generation. It grounds answers in documents.\n"
+    "Each chunk is embedded and stored.\n\n"
+    "Queries are embedded too. The closest chunks are retrieved and passed "
+    "to the model as context.\n\n"
+    + "".join(str(number) for number in range(100))  # long run with no separator
+    + "\nA final short line."
+)
+
+
+def _covered(text: str, chunks: list[str]) -> set[int]:
+    """Return the offsets of text covered by chunks located in order."""
+    covered = set()
+    position = 0
+    for chunk in chunks:
+        start = text.index(chunk, position)
+        covered.update(range(start, start + len(chunk)))
+        position = start + 1
+    return covered
+
+
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(40, 0), (40, 15), (100, 30), (25, 24)])
+def test_chunks_are_bounded_and_cover_the_text(chunk_size, chunk_overlap):
+    splitter = SeparatorTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    chunks = splitter.split_text(TEXT)
+
+    assert all(0 < len(chunk) <= chunk_size for chunk in chunks)
+    covered = _covered(TEXT, chunks)
+    assert all(index in covered for index, char in enumerate(TEXT) if not char.isspace())
+
+
+def test_chunk_ends_on_highest_priority_boundary():
+    splitter = SeparatorTextSplitter(chunk_size=120, chunk_overlap=0)
+
+    chunks = splitter.split_text(TEXT)
+
+    assert chunks[0] == (
+        "Retrieval augmented generation. It grounds answers in documents.\n"
+        "Each chunk is embedded and stored."
+    )
+
+
+def test_hard_cuts_terminate_without_overlap():
+    text = "x" * 1000
+    splitter = SeparatorTextSplitter(chunk_size=100, chunk_overlap=99)
+
+    chunks = splitter.split_text(text)
+
+    assert chunks == ["x" * 100] * 10
+
+
+def test_overlap_starts_at_earliest_boundary_of_the_cut_separator():
+    splitter = SeparatorTextSplitter(chunk_size=9, chunk_overlap=6)
+
+    chunks = splitter.split_text("aa bb cc dd ee ff gg")
+
+    # Cut on a word boundary, so overlap keeps as many whole words as fit
+    assert chunks[:2] == ["aa bb cc", "bb cc dd"]
+
+
+def _words(rng: random.Random, count: int) -> str:
+    words = ["retrieval", "vector", "chunk", "answer", "embedding", "query", "the", "a"]
+    return " ".join(rng.choices(words, k=count))
+
+
+def _paragraph_text(rng: random.Random) -> str:
+    return "\n\n".join(_words(rng, rng.randint(3, 12)) + "." for _ in range(400))
+
+
+def _line_text(rng: random.Random) -> str:
+    return "\n".join(_words(rng, rng.randint(3, 10)) + "." for _ in range(600))
+
+
+def _word_text(rng: random.Random) -> str:
+    return _words(rng, 4000)
+
+
+@pytest.mark.parametrize("make_text", [_paragraph_text, _line_text, _word_text])
+def test_consecutive_chunks_share_about_chunk_overlap(make_text):
+    text = make_text(random.Random(0))
+    splitter = SeparatorTextSplitter(chunk_size=1000, chunk_overlap=200)
+
+    chunks = splitter.split_text(text)
+
+    assert len(chunks) > 10
+    position = 0
+    previous_end = None
+    for chunk in chunks:
+        start = text.index(chunk, position)
+        if previous_end is not None:
+            assert previous_end - start >= 100
+        previous_end = start + len(chunk)
+        position = start + 1
+
+
+def test_custom_length_function_is_rejected():
+    with pytest.raises(ValueError, match="characters"):
+        SeparatorTextSplitter(chunk_size=100, chunk_overlap=0, length_function=lambda text: len(text.split()))
@@ -0,0 +1,161 @@
+"""Tests for VectorStoreService collection setup and ingest."""
+
+import asyncio
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.http.models import Distance, VectorParams
+
+from app.core import vector_store
+from app.core.vector_store import EMBEDDING_DIMENSION, VectorStoreService
+
+
+@pytest.fixture
+def async_qdrant_client(monkeypatch):
+    """Point VectorStoreService's async client at an in-memory Qdrant instance."""
+    client = AsyncQdrantClient(":memory:")
+    monkeypatch.setattr(vector_store, "get_async_qdrant_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def qdrant_client(monkeypatch, async_qdrant_client):
+    """Point VectorStoreService at an in-memory Qdrant instance and fake embeddings."""
+    client = QdrantClient(":memory:")
+    embeddings = DeterministicFakeEmbedding(size=EMBEDDING_DIMENSION)
+    monkeypatch.setattr(vector_store, "get_cached_embedding_model", lambda: embeddings)
+    monkeypatch.setattr(vector_store, "get_qdrant_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def streaming_service(qdrant_client, async_qdrant_client):
+    """VectorStoreService whose streaming path writes to the async in-memory client."""
+    service = VectorStoreService(collection_name="docs")
+    asyncio.run(async_qdrant_client.create_collection(
+        "docs",
+        vectors_config=VectorParams(size=EMBEDDING_DIMENSION, distance=Distance.DOT),
+    ))
+    return service
+
+
+def _distance(client: QdrantClient, collection_name: str) -> Distance:
+    return client.get_collection(collection_name).config.params.vectors.distance
+
+
+def test_fresh_collection_uses_dot_distance(qdrant_client):
+    service = VectorStoreService(collection_name="fresh")
+
+    assert service.distance == Distance.DOT
+    assert _distance(qdrant_client, "fresh") == Distance.DOT
+
+
+def test_existing_cosine_collection_keeps_its_distance(qdrant_client):
+    qdrant_client.create_collection(
+        "legacy",
+        vectors_config=VectorParams(size=EMBEDDING_DIMENSION, distance=Distance.COSINE),
+    )
+
+    service = VectorStoreService(collection_name="legacy")
+
+    assert service.distance == Distance.COSINE
+
+
+@pytest.mark.parametrize("distance", [Distance.DOT, Distance.COSINE])
+def test_recreate_after_delete_keeps_distance(qdrant_client, distance):
+    qdrant_client.create_collection(
+        "docs",
+        vectors_config=VectorParams(size=EMBEDDING_DIMENSION, distance=distance),
+    )
+    service = VectorStoreService(collection_name="docs")
+
+    service.delete_collection()
+
+    assert _distance(qdrant_client, "docs") == distance
+    # A restart against the recreated collection must still initialize
+    assert VectorStoreService(collection_name="docs").distance == distance
+
+
+def test_streaming_add_reports_unique_ids(streaming_service, async_qdrant_client):
+    documents = [
+        Document(page_content=text, metadata={"source": "notes.txt"})
+        for text in ["repeated", "unique", "repeated", "repeated"]
+    ]
+
+    ids = asyncio.run(streaming_service.aadd_documents_streaming(documents, batch_size=2))
+
+    assert len(ids) == len(set(ids)) == 2
+    count = asyncio.run(async_qdrant_client.count("docs"))
+    assert count.count == len(ids)
+
+
+def test_streaming_add_stops_pending_upsert_on_embedding_error(streaming_service):
+    upsert_cancelled = False
+
+    async def slow_upsert(ids, documents, vectors):
+        nonlocal upsert_cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            upsert_cancelled = True
+            raise
+
+    class FailingEmbeddings(DeterministicFakeEmbedding):
+        async def aembed_documents(self, texts):
+            if texts == ["second"]:
+                raise RuntimeError("embedding failed")
+            return [[0.0] * EMBEDDING_DIMENSION for _ in texts]
+
+    streaming_service._aupsert = slow_upsert
+    streaming_service.embeddings = FailingEmbeddings(size=EMBEDDING_DIMENSION)
+    documents = [Document(page_content=text) for text in ["first", "second"]]
+
+    async def run():
+        with pytest.raises(RuntimeError, match="embedding failed"):
+            await streaming_service.aadd_documents_streaming(documents, batch_size=1)
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    assert asyncio.run(run()) == set()
+    assert upsert_cancelled
+
+
+def test_async_retriever_embeds_through_aembed_query(streaming_service):
+    class SpyEmbeddings(DeterministicFakeEmbedding):
+        sync_calls: int = 0
+        async_calls: int = 0
+
+        def embed_query(self, text):
+            self.sync_calls += 1
+            return super().embed_query(text)
+
+        async def aembed_query(self, text):
+            self.async_calls += 1
+            return super().embed_query(text)
+
+    documents = [Document(page_content=text) for text in ["alpha", "beta", "gamma"]]
+    asyncio.run(streaming_service.aadd_documents_streaming(documents))
+    spy = SpyEmbeddings(size=EMBEDDING_DIMENSION)
+    streaming_service.embeddings = spy
+
+    results = asyncio.run(streaming_service.get_retriever(k=2).ainvoke("alpha"))
+
+    assert [doc.page_content for doc in results][0] == "alpha"
+    assert len(results) == 2
+    assert (spy.async_calls, spy.sync_calls) == (1, 0)
+
+
+def test_identical_text_on_different_pages_gets_distinct_ids(streaming_service, async_qdrant_client):
+    documents = [
+        Document(page_content="header", metadata={"source": "report.pdf", "page": page})
+        for page in range(3)
+    ]
+
+    ids = asyncio.run(streaming_service.aadd_documents_streaming(documents))
+
+    assert len(set(ids)) == 3
+    count = asyncio.run(async_qdrant_client.count("docs"))
+    assert count.count == 3
+    # Re-uploading unchanged content overwrites the same points
+    assert asyncio.run(streaming_service.aadd_documents_streaming(documents)) == ids